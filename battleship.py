@@ -3,13 +3,21 @@ battleship.py
 
 Contains core data structures and logic for Battleship, including:
  - Board class for storing ship positions, hits, misses
- - Utility function parse_coordinate for translating e.g. 'B5' -> (row, col)
+ - CompactBoard / Ship: a low-memory equivalent of Board (bytearray cells, ship ranges)
+ - Utility function parse_coordinate for translating e.g. 'B5' -> (row, col) (see commands.py)
  - A test harness run_single_player_game() to demonstrate the logic in a local, single-player mode
+ - Online single- and two-player loops that drive the rules in engine.py over socket file objects
 
 """
 
+import json
 import random as rd
 
+from engine import GameEngine, FIRE, QUIT, HIT, MISS, ALREADY_SHOT, GAME_OVER, TURN
+from outbox import Outbox
+from commands import parse_command, lookup_coordinate, DPRIV, DPUB, HELP, ERROR
+from commitment import LayoutCommitment, CommitRevealAudit, player_record, match_record
+
 BOARD_SIZE = 10
 SHIPS = [
     ("Carrier", 5),
@@ -64,19 +72,21 @@ class Board:
         self.display_grid = [['.' for _ in range(size)] for _ in range(size)]
         self.placed_ships = []  # e.g. [{'name': 'Destroyer', 'positions': {(r, c), ...}}, ...] - list of dict [{}]
 
-    def place_ships_randomly(self, ships=SHIPS):
+    def place_ships_randomly(self, ships=SHIPS, rng=None):
         """
         Randomly place each ship in 'ships' on the hidden_grid, storing positions for each ship.
         In a networked version, you might parse explicit placements from a player's commands
         (e.g. "PLACE A1 H BATTLESHIP") or prompt the user for board coordinates and placement orientations; 
         the self.place_ships_manually() can be used as a guide.
+        Pass a seeded random.Random as 'rng' for a reproducible layout (defaults to the global state).
         """
+        rng = rng if rng is not None else rd
         for ship_name, ship_size in ships:
             placed = False
             while not placed:
-                orientation = random.randint(0, 1)  # 0 => horizontal, 1 => vertical
-                row = random.randint(0, self.size - 1)
-                col = random.randint(0, self.size - 1)
+                orientation = rng.randint(0, 1)  # 0 => horizontal, 1 => vertical
+                row = rng.randint(0, self.size - 1)
+                col = rng.randint(0, self.size - 1)
 
                 if self.can_place_ship(row, col, ship_size, orientation):
                     occupied_positions = self.do_place_ship(row, col, ship_size, orientation)
@@ -101,7 +111,7 @@ class Board:
 
         def validate_coord(coord):
             try:
-                parse_coordinate(coord)
+                lookup_coordinate(coord, self.size)
                 return True
             except ValueError:
                 return False
@@ -129,7 +139,7 @@ class Board:
                     continue
 
                 try:
-                    row, col = parse_coordinate(coord_str)
+                    row, col = lookup_coordinate(coord_str, self.size)
                 except ValueError as e:
                     send(f"  [!] Invalid coordinate: {e}")
                     continue
@@ -169,7 +179,7 @@ class Board:
                 orientation_str = input("  Orientation? Enter 'H' (horizontal) or 'V' (vertical): ").strip().upper()
 
                 try:
-                    row, col = parse_coordinate(coord_str)
+                    row, col = lookup_coordinate(coord_str, self.size)
                 except ValueError as e:
                     print(f"  [!] Invalid coordinate: {e}")
                     continue
@@ -285,6 +295,12 @@ class Board:
                 return False
         return True
 
+    def ships_remaining(self):
+        """
+        Return the number of ships that still have at least one un-hit position.
+        """
+        return sum(1 for ship in self.placed_ships if len(ship['positions']) > 0)
+
     def print_display_grid_two_player(self, wfile, show_hidden_board=False):
         """
         Print the board as a 2D grid.
@@ -315,24 +331,239 @@ class Board:
 
 
 
+# Cell states for CompactBoard, one byte each (same symbols as Board's grids)
+WATER, SHIP, HIT_CELL, MISS_CELL = b'.SXo'
+_HIDE_SHIPS = bytes.maketrans(b'S', b'.')
+
+
+class Ship:
+    """
+    A placed ship stored as a range instead of a set of cells:
+    start (row, col), length, orientation (0 => horizontal, 1 => vertical) and a hit counter.
+    """
+    __slots__ = ('name', 'row', 'col', 'length', 'orientation', 'hits')
+
+    def __init__(self, name, row, col, length, orientation):
+        self.name = name
+        self.row = row
+        self.col = col
+        self.length = length
+        self.orientation = orientation
+        self.hits = 0
+
+    def covers(self, row, col):
+        if self.orientation == 0:
+            return row == self.row and self.col <= col < self.col + self.length
+        return col == self.col and self.row <= row < self.row + self.length
+
+    def positions(self):
+        """
+        Yield every (r, c) the ship occupies.
+        """
+        for i in range(self.length):
+            if self.orientation == 0:
+                yield self.row, self.col + i
+            else:
+                yield self.row + i, self.col
+
+    def is_sunk(self):
+        return self.hits >= self.length
+
+
+class CompactBoard:
+    """
+    Low-memory alternative to Board, for servers holding many live matches.
+      - self.cells: one bytearray of size * size cell states (WATER, SHIP, HIT_CELL, MISS_CELL)
+      - self.ships: list of Ship ranges
+
+    hidden_grid, display_grid and placed_ships are built on demand from those, so
+    render_board(), the game loops and engine.GameEngine work unchanged.
+    Only random placement is supported: there is no place_ships_manually_two_player()
+    or print_display_grid_two_player(), so manual-placement paths need Board.
+    """
+    __slots__ = ('size', 'cells', 'ships')
+
+    def __init__(self, size=BOARD_SIZE):
+        self.size = size
+        self.cells = bytearray(b'.' * (size * size))
+        self.ships = []
+
+    def place_ships_randomly(self, ships=SHIPS, rng=None):
+        """
+        Randomly place each ship in 'ships', same as Board.place_ships_randomly().
+        """
+        rng = rng if rng is not None else rd
+        for ship_name, ship_size in ships:
+            while True:
+                orientation = rng.randint(0, 1)  # 0 => horizontal, 1 => vertical
+                row = rng.randint(0, self.size - 1)
+                col = rng.randint(0, self.size - 1)
+                if self.can_place_ship(row, col, ship_size, orientation):
+                    self.place_ship(ship_name, row, col, ship_size, orientation)
+                    break
+
+    def can_place_ship(self, row, col, ship_size, orientation):
+        """
+        Check if a ship of length 'ship_size' fits at (row, col) on empty water.
+        """
+        if orientation == 0:
+            if col + ship_size > self.size:
+                return False
+            step = 1
+        else:
+            if row + ship_size > self.size:
+                return False
+            step = self.size
+        start = row * self.size + col
+        return self.cells[start:start + step * ship_size:step].count(SHIP) == 0
+
+    def place_ship(self, ship_name, row, col, ship_size, orientation):
+        """
+        Mark the ship's cells and record it as a Ship range. Returns the Ship.
+        """
+        step = 1 if orientation == 0 else self.size
+        start = row * self.size + col
+        self.cells[start:start + step * ship_size:step] = b'S' * ship_size
+        ship = Ship(ship_name, row, col, ship_size, orientation)
+        self.ships.append(ship)
+        return ship
+
+    def fire_at(self, row, col):
+        """
+        Fire at (row, col). Same return values as Board.fire_at().
+        """
+        i = row * self.size + col
+        cell = self.cells[i]
+        if cell == SHIP:
+            self.cells[i] = HIT_CELL
+            for ship in self.ships:
+                if ship.covers(row, col):
+                    ship.hits += 1
+                    return ('hit', ship.name if ship.is_sunk() else None)
+            return ('hit', None)
+        elif cell == WATER:
+            self.cells[i] = MISS_CELL
+            return ('miss', None)
+        return ('already_shot', None)
+
+    def all_ships_sunk(self):
+        for ship in self.ships:
+            if not ship.is_sunk():
+                return False
+        return True
+
+    def ships_remaining(self):
+        return sum(1 for ship in self.ships if not ship.is_sunk())
+
+    @property
+    def hidden_grid(self):
+        size = self.size
+        return [self.cells[r * size:(r + 1) * size].decode('ascii') for r in range(size)]
+
+    @property
+    def display_grid(self):
+        size = self.size
+        return [self.cells[r * size:(r + 1) * size].translate(_HIDE_SHIPS).decode('ascii') for r in range(size)]
+
+    @property
+    def placed_ships(self):
+        """
+        Board-style view: [{'name': ..., 'positions': set of un-hit (r, c)}, ...].
+        """
+        return [{
+            'name': ship.name,
+            'positions': {(r, c) for r, c in ship.positions() if self.cells[r * self.size + c] == SHIP}
+        } for ship in self.ships]
+
+
+
+
+def render_board(board, grid=None):
+    """
+    Build the full GRID block for a board as one string, ready to queue in a single write.
+    'grid' defaults to the board's display_grid (pass board.hidden_grid for the owner's view).
+    """
+    grid = board.display_grid if grid is None else grid
+    lines = ["GRID", "  " + " ".join(str(i + 1).rjust(2) for i in range(board.size))]
+    for r in range(board.size):
+        lines.append(f"{chr(ord('A') + r):2} {' '.join(grid[r])}")
+    lines.append('\n')
+    return '\n'.join(lines)
+
+
+class PlayerView:
+    """
+    What a command handler may touch for one player:
+      - wfile: where to write replies
+      - own_board: the player's own board (None in single-player mode)
+      - target: the board the player fires at
+    """
+    __slots__ = ('wfile', 'own_board', 'target')
+
+    def __init__(self, wfile, own_board, target):
+        self.wfile = wfile
+        self.own_board = own_board
+        self.target = target
+
+
+def _show_help(view, arg):
+    view.wfile.write(INSTRUCTIONS + '\n')
+
+
+def _show_private_board(view, arg):
+    if view.own_board is None:
+        view.wfile.write("[INFO] There is no private board in single-player mode.\n")
+    else:
+        view.wfile.write(render_board(view.own_board, view.own_board.hidden_grid))
+
+
+def _show_public_board(view, arg):
+    view.wfile.write(render_board(view.own_board if view.own_board is not None else view.target))
+
+
+def _show_error(view, arg):
+    view.wfile.write(f"[INFO] {arg}\n")
+
+
+# Commands that only answer the player, shared by both loops; QUIT and FIRE change the game
+# state and are handled by each loop itself
+COMMAND_HANDLERS = {
+    HELP: _show_help,
+    DPRIV: _show_private_board,
+    DPUB: _show_public_board,
+    ERROR: _show_error,
+}
+
+
+def run_two_player_game_online(p1_rfile, p1_wfile, p2_rfile, p2_wfile, rules=None, board_cls=Board,
+                               commit_reveal=False, rng=None, audit_log=None):
+    """
+    Run a two-player match over socket file objects.
+    The turn flow is decided by an engine.GameEngine; 'rules' selects the variant
+    ('classic', 'salvo', 'extra_shot' or a rules object), defaulting to classic.
+    'board_cls' can be CompactBoard to trade a little CPU for a much smaller match.
+    With 'commit_reveal', each layout is committed at placement (see commitment.py); when the
+    match ends each client is sent its opponent's reveal and shot log as an [AUDIT] line to
+    verify for itself, and 'audit_log' (a path) saves the whole record for offline auditors.
+    'rng' is the match's random.Random; seed it to make placement and turn order reproducible.
+    """
+    # Messages are queued per player and sent in one batch at the end of each turn
+    p1_wfile = Outbox.wrap(p1_wfile)
+    p2_wfile = Outbox.wrap(p2_wfile)
 
-def run_two_player_game_online(p1_rfile, p1_wfile, p2_rfile, p2_wfile):
     def send(wfile, msg):
         wfile.write(msg + '\n')
-        wfile.flush()
 
     def send_board(wfile, board):
-        wfile.write("GRID\n")
-        wfile.write("  " + " ".join(str(i + 1).rjust(2) for i in range(board.size)) + '\n')
-        for r in range(board.size):
-            row_label = chr(ord('A') + r)
-            row_str = " ".join(board.display_grid[r][c] for c in range(board.size))
-            wfile.write(f"{row_label:2} {row_str}\n")
-        wfile.write('\n')
-        wfile.flush()
+        wfile.write(render_board(board))
 
     def recv(rfile):
-        return rfile.readline().strip()
+        # The turn is over once we need input: push out everything queued for both players
+        p1_wfile.drain()
+        p2_wfile.drain()
+        line = rfile.readline()
+        # A closed connection counts as quitting, rather than spinning on empty reads
+        return line.strip() if line else 'quit'
 
     def place_ships_thread(rfile, wfile, board):
         send(wfile, "Place ships manually (M) or randomly (R)? [M/R]: ")
@@ -349,8 +580,8 @@ def run_two_player_game_online(p1_rfile, p1_wfile, p2_rfile, p2_wfile):
 
 
     # Boards for each player
-    board1 = Board(BOARD_SIZE)
-    board2 = Board(BOARD_SIZE)
+    board1 = board_cls(BOARD_SIZE)
+    board2 = board_cls(BOARD_SIZE)
 
     # # Send both request for player for ship placement concurrently
     # send(p1_wfile, "Waiting for ship placement")
@@ -372,168 +603,127 @@ def run_two_player_game_online(p1_rfile, p1_wfile, p2_rfile, p2_wfile):
     # else:
     #     board2.place_ships_randomly()
 
+    # Separate streams per board and for the coin flip, so changing one doesn't shift the others
+    rng = rng if rng is not None else rd.Random()
+    placement_rngs = (rd.Random(rng.getrandbits(64)), rd.Random(rng.getrandbits(64)))
+    first_turn = rng.randint(0, 1)
+
     send(p1_wfile, "[INFO] Player 1: Place your ships randomly.")
-    board1.place_ships_randomly()
+    board1.place_ships_randomly(rng=placement_rngs[0])
     send(p2_wfile, "[INFO] Player 2: Place your ships randomly.")
-    board2.place_ships_randomly()
+    board2.place_ships_randomly(rng=placement_rngs[1])
 
     # If the 2 players had already set up their ship, start the game
     # When player hit/miss, report to both players what just happened
-    current_turn = rd.randint(0,1)
-    moves_1 = 0
-    moves_2 = 0
-    while True:
-        if current_turn == 1:
-            send(p2_wfile, "[INFO] Opponent is taking their turn.")
-            send(p1_wfile, "\nYour turn! Enter coordinate to fire (e.g. b5): ")
-            send_board(p1_wfile, board2)  # show opponent's public board
-
-            guess = recv(p1_rfile)
-
-            if guess.lower() == 'quit':
-                send(p1_wfile, "Thanks for playing. Goodbye.")
-                send(p2_wfile, "[INFO] Opponent quit. Game over")
-                return
-            elif guess.lower() == 'dpriv':
-                send_board(p1_wfile, board1.hidden_grid)
-                continue
-            elif guess.lower() == 'dpub':
-                send_board(p1_wfile, board1)
-                continue
-            elif guess.lower() == 'help':
-                send(p1_wfile, INSTRUCTIONS)
+    # engine.targets[0] is what player 1 fires at, engine.targets[1] is what player 2 fires at
+    engine = GameEngine([board2, board1], rules=rules, first_turn=first_turn)
+    rfiles = (p1_rfile, p2_rfile)
+    wfiles = (p1_wfile, p2_wfile)
+    own_boards = (board1, board2)
+    views = (PlayerView(p1_wfile, board1, board2), PlayerView(p2_wfile, board2, board1))
+
+    audit = None
+    if commit_reveal:
+        # Commit to both layouts before the first shot; results are checked in one pass at the end
+        commitments = tuple(LayoutCommitment(board) for board in own_boards)
+        audit = CommitRevealAudit(BOARD_SIZE, SHIPS)
+        for p in (0, 1):
+            audit.commit(p, commitments[p].root)
+            send(wfiles[1 - p], f"[INFO] Opponent layout commitment: {commitments[p].root.hex()}")
+
+    def announce_turn(player, shots):
+        send(wfiles[1 - player], "[INFO] Opponent is taking their turn.")
+        send(wfiles[player], "\nYour turn! Enter coordinate to fire (e.g. b5): ")
+        if shots > 1:
+            send(wfiles[player], f"[INFO] You have {shots} shots this turn.")
+        send_board(wfiles[player], engine.targets[player])  # show opponent's public board
+
+    try:
+        # The turn only changes hands on a TURN event, so announce it here and there only
+        announce_turn(engine.turn, engine.shots_left)
+        while not engine.over:
+            player = engine.turn
+            my_wfile, opp_wfile = wfiles[player], wfiles[1 - player]
+            target = engine.targets[player]
+
+            guess = recv(rfiles[player])
+
+            kind, arg = parse_command(guess, target.size)
+            handler = COMMAND_HANDLERS.get(kind)
+            if handler is not None:
+                handler(views[player], arg)
                 continue
+            if kind == QUIT:
+                engine.apply((QUIT, player))
+                send(my_wfile, "Thanks for playing. Goodbye.")
+                send(opp_wfile, "[INFO] Opponent quit. Game over")
+                return
 
             try:
-                parsed = parse_coordinate(p1_wfile, guess)
-                if parsed is None:
-                    continue
-
-                row, col = parsed
-                result, sunk_name = board2.fire_at(row, col)
-                moves_1 += 1
-
-                if result == 'hit':
-                    if sunk_name:
-                        send(p1_wfile, f"HIT! You sank their {sunk_name}!")
-                        send_board(p1_wfile, board2)
-                        send(p2_wfile, f"[INFO] OPPONENT HIT AT: {parsed} ! They sank your {sunk_name}!")
-                    else:
-                        send(p1_wfile, "HIT!")
-                        send_board(p1_wfile, board2)
-                        send(p2_wfile, f"HIT! OPPONENT HIT AT: {parsed} !")
-                    if board2.all_ships_sunk():
-                        send_board(p1_wfile, board2)
-                        send_board(p1_wfile, board2)
-                        send(p1_wfile, f"Congratulations! You sank all ships in {moves_1} moves.")
-                        send(p2_wfile, f"YOU LOST! DON'T GIVE UP!")
-                        break
-                elif result == 'miss':
-                    send(p1_wfile, "MISS!")
-                    send_board(p1_wfile, board2)
-                    send(p2_wfile, f"MISS! OPPONENT HIT AT: {parsed}!")
-                elif result == 'already_shot':
-                    send(p1_wfile, "You've already fired at that location.")
-                    send_board(p1_wfile, board2)
-                    continue
+                row, col = arg
+                events = engine.apply((FIRE, player, row, col))
             except ValueError as e:
-                send(p1_wfile, f"Invalid input: {e}")
-
-            # switch turn
-            current_turn = 2
-        else:
-            send(p1_wfile, "[INFO] Opponent is taking their turn.")
-            send(p2_wfile, "\nYour turn! Enter coordinate to fire (e.g. b5): ")
-            send_board(p2_wfile, board1)  # show opponent public board
-
-            guess = recv(p2_rfile)
-
-            if guess.lower() == 'quit':
-                send(p2_wfile, "Thanks for playing. Goodbye.")
-                send(p1_wfile, "[INFO] Opponent quit. Waiting 60 seconds before exiting the match")
-                return
-            elif guess.lower() == 'help':
-                send(p2_wfile, INSTRUCTIONS)
+                send(my_wfile, f"Invalid input: {e}")
                 continue
 
-            try:
-                parsed = parse_coordinate(p2_wfile, guess)
-                if parsed is None:
-                    continue
-
-                row, col = parsed
-                result, sunk_name = board1.fire_at(row, col)
-                moves_2 += 1
+            for kind, who, coord, detail in events:
+                if audit is not None and kind in (HIT, MISS, ALREADY_SHOT):
+                    audit.record(1 - player, coord[0], coord[1], kind, detail)
 
-                if result == 'hit':
-                    if sunk_name:
-                        send(p2_wfile, f"HIT! You sank their {sunk_name}!")
-                        send_board(p1_wfile, board2)
-                        send(p1_wfile, f"[INFO] OPPONENT HIT AT: {parsed} ! They sank your {sunk_name}!")
+                if kind == HIT:
+                    if detail:
+                        send(my_wfile, f"HIT! You sank their {detail}!")
+                        send(opp_wfile, f"[INFO] OPPONENT HIT AT: {coord} ! They sank your {detail}!")
                     else:
-                        send(p2_wfile, "HIT!")
-                        send_board(p2_wfile, board1)
-                        send(p1_wfile, f"HIT! OPPONENT HIT AT: {parsed} !")
-                    if board1.all_ships_sunk():
-                        send_board(p2_wfile, board1)
-                        send(p2_wfile, f"Congratulations! You sank all ships in {moves_2} moves.")
-                        send(p1_wfile, f"YOU LOST! DON'T GIVE UP!")
-                        return
-                elif result == 'miss':
-                    send(p2_wfile, "MISS!")
-                    send_board(p2_wfile, board1)
-                    send(p1_wfile, f"MISS! OPPONENT HIT AT: {parsed} !")
-                elif result == 'already_shot':
-                    send(p2_wfile, "You've already fired at that location.")
-                    send_board(p2_wfile, board1)
-                    continue
-            except ValueError as e:
-                send(p2_wfile, f"Invalid input: {e}")
-
-            # switch turn
-            current_turn = 1
-
-
-def parse_coordinate(wfile, coord_str):
-    def send(wfile, msg):
-        wfile.write(msg + '\n')
-        wfile.flush()
-
+                        send(my_wfile, "HIT!")
+                        send(opp_wfile, f"HIT! OPPONENT HIT AT: {coord} !")
+                    send_board(my_wfile, target)
+                elif kind == MISS:
+                    send(my_wfile, "MISS!")
+                    send_board(my_wfile, target)
+                    send(opp_wfile, f"MISS! OPPONENT HIT AT: {coord} !")
+                elif kind == ALREADY_SHOT:
+                    send(my_wfile, "You've already fired at that location.")
+                    send_board(my_wfile, target)
+                elif kind == GAME_OVER:
+                    send(my_wfile, f"Congratulations! You sank all ships in {detail} moves.")
+                    send(opp_wfile, "YOU LOST! DON'T GIVE UP!")
+                elif kind == TURN:
+                    announce_turn(who, detail)
+
+            if not engine.over and engine.turn == player and events[0][0] != ALREADY_SHOT:
+                # Salvo / extra-shot rules: the shooter keeps the turn
+                send(my_wfile, f"[INFO] You have {engine.shots_left} shot(s) left this turn.")
+    finally:
+        if audit is not None and engine.over:
+            # Hand each client the opponent's reveal; verifying it is up to the client, not us
+            for p in (0, 1):
+                record = {'size': BOARD_SIZE, 'ships': SHIPS,
+                          'record': player_record(commitments[p], audit.shots[p])}
+                send(wfiles[1 - p], "[AUDIT] " + json.dumps(record))
+            if audit_log is not None:
+                with open(audit_log, 'w') as f:
+                    json.dump(match_record(audit, commitments), f)
+        p1_wfile.drain()
+        p2_wfile.drain()
+
+
+def parse_coordinate(wfile, coord_str, size=BOARD_SIZE):
     """
     Convert something like 'B5' into zero-based (row, col).
     Example: 'A1' => (0, 0), 'C10' => (2, 9)
-    ✅
-    - Check length
-    - Check cols digit for integer type
-    - Check bounds for row and col
-    
-    Return row, col if valid, else return None
-    """
-    # Check length
-    if len(coord_str) < 2:
-        send(wfile, "[INFO] Coordinate too short. Please enter a valid coordinate (e.g. b5)\n")
-
-    coord_str = coord_str.strip().upper()
-    row_letter = coord_str[0]
-    col_digits = coord_str[1:].strip()
-
-    if not row_letter.isalpha() or not ('A' <= row_letter <= 'K'):
-        send(wfile, "[INFO] Row must be a letter from A-K. Please enter a valid coordinate (e.g. B5)\n")
-        return None
-    if not col_digits.isdigit():
-        send(wfile, "[INFO] Column must be a digit from 0-10. Please enter a valid coordinate (e.g. B5)\n")
-        return None
 
-    col = int(col_digits)
-    if not (1 <= col <= 11):
-        send(wfile, "[INFO] Column must be a number from 1 to 11. Please enter a valid coordinate (e.g. b5)\n")
+    Return row, col if valid; otherwise write the reason to wfile and return None.
+    The game loops use commands.parse_command directly; this wrapper is kept for callers
+    that still want the error written for them.
+    """
+    try:
+        return lookup_coordinate(coord_str, size)
+    except ValueError as e:
+        wfile.write(f"[INFO] {e}\n")
+        wfile.flush()
         return None
 
-    row = ord(row_letter) - ord('A')
-    col = int(col_digits) - 1  # zero-based
-
-    return row, col
-
 
 # def run_single_player_game_locally():
 #     """
@@ -587,71 +777,82 @@ def parse_coordinate(wfile, coord_str):
 #             print("  >> Invalid input: ", e)
 
 
-def run_single_player_game_online(rfile, wfile):
+def run_single_player_game_online(rfile, wfile, rules=None, board_cls=Board, rng=None):
     """
     A test harness for running the single-player game with I/O redirected to socket file objects.
     Expects:
       - rfile: file-like object to .readline() from client
       - wfile: file-like object to .write() back to client
+      - rules: optional rule variant for the engine.GameEngine (defaults to classic)
+      - board_cls: Board (default) or CompactBoard
+      - rng: optional random.Random for ship placement (seed it for reproducible runs)
     """
 
+    wfile = Outbox.wrap(wfile)
+
     def send(msg):
         wfile.write(msg + '\n')
-        wfile.flush()
 
     def send_board(board):
-        wfile.write("GRID\n")
-        wfile.write("  " + " ".join(str(i + 1).rjust(2) for i in range(board.size)) + '\n')
-        for r in range(board.size):
-            row_label = chr(ord('A') + r)
-            row_str = " ".join(board.display_grid[r][c] for c in range(board.size))
-            wfile.write(f"{row_label:2} {row_str}\n")
-        wfile.write('\n')
-        wfile.flush()
+        wfile.write(render_board(board))
 
     def recv():
-        return rfile.readline().strip()
+        wfile.drain()
+        line = rfile.readline()
+        return line.strip() if line else 'quit'
 
-    board = Board(BOARD_SIZE)
-    board.place_ships_randomly(SHIPS)
+    board = board_cls(BOARD_SIZE)
+    board.place_ships_randomly(SHIPS, rng=rng)
 
     send("Welcome to Online Single-Player Battleship! Try to sink all the ships. Type 'quit' to exit.")
 
-    moves = 0
-    while True:
-        send_board(board)
-        send("Enter coordinate to fire at (e.g. B5):")
-        guess = recv()
-        if guess.lower() == 'quit':
-            send("Thanks for playing. Goodbye.")
-            return
-        elif guess.lower() == 'help':
-            send(INSTRUCTIONS)
-            continue
-
-        try:
-            parsed = parse_coordinate(wfile, guess)
-            if parsed is None:
+    engine = GameEngine([board], rules=rules)
+    view = PlayerView(wfile, None, board)
+    if engine.shots_left > 1:
+        send(f"[INFO] New volley: you have {engine.shots_left} shots.")
+    try:
+        while not engine.over:
+            send_board(board)
+            send("Enter coordinate to fire at (e.g. B5):")
+            guess = recv()
+            kind, arg = parse_command(guess, board.size)
+            handler = COMMAND_HANDLERS.get(kind)
+            if handler is not None:
+                handler(view, arg)
+                continue
+            if kind == QUIT:
+                engine.apply((QUIT, 0))
+                send("Thanks for playing. Goodbye.")
+                return
+
+            try:
+                row, col = arg
+                events = engine.apply((FIRE, 0, row, col))
+            except ValueError as e:
+                send(f"Invalid input: {e}")
                 continue
-            row, col = parsed
-            result, sunk_name = board.fire_at(row, col)
-            moves += 1
 
-            if result == 'hit':
-                if sunk_name:
-                    send(f"HIT! You sank the {sunk_name}!")
-                else:
-                    send("HIT!")
-                if board.all_ships_sunk():
+            for kind, _, _, detail in events:
+                if kind == HIT:
+                    if detail:
+                        send(f"HIT! You sank the {detail}!")
+                    else:
+                        send("HIT!")
+                elif kind == MISS:
+                    send("MISS!")
+                elif kind == ALREADY_SHOT:
+                    send("You've already fired at that location.")
+                elif kind == GAME_OVER:
                     send_board(board)
-                    send(f"Congratulations! You sank all ships in {moves} moves.")
-                    return
-            elif result == 'miss':
-                send("MISS!")
-            elif result == 'already_shot':
-                send("You've already fired at that location.")
-        except ValueError as e:
-            send(f"Invalid input: {e}")
+                    send(f"Congratulations! You sank all ships in {detail} moves.")
+                elif kind == TURN and detail > 1:
+                    send(f"[INFO] New volley: you have {detail} shots.")
+
+            if not engine.over and events[-1][0] not in (TURN, ALREADY_SHOT):
+                send(f"[INFO] You have {engine.shots_left} shot(s) left in this volley.")
+    finally:
+        wfile.drain()
+
 
 # if __name__ == "__main__":
 #     # Optional: run this file as a script to test single-player mode
@@ -7,9 +7,12 @@ Simply pipes user input to the server, and prints all server responses.
 TODO: Fix the message synchronization issue using concurrency (Tier 1, item 1).
 """
 
+import json
 import socket
 import threading
 
+from commitment import verify_player_record
+
 HOST = '127.0.0.1'
 PORT = 6000
 
@@ -17,6 +20,9 @@ PORT = 6000
 
 clientNumber = 0
 
+COMMITMENT_PREFIX = "[INFO] Opponent layout commitment: "
+AUDIT_PREFIX = "[AUDIT] "
+
 # HINT: The current problem is that the client is reading from the socket,
 # then waiting for user input, then reading again. This causes server
 # messages to appear out of order.
@@ -27,8 +33,23 @@ clientNumber = 0
 #
 # import threading
 
+def check_audit(line, announced_root):
+    """
+    Verify the opponent's [AUDIT] reveal ourselves, against the root announced at placement,
+    rather than taking the server's word for it.
+    """
+    audit = json.loads(line[len(AUDIT_PREFIX):])
+    if announced_root is None:
+        return "[AUDIT] No layout commitment was announced; cannot verify the opponent's board."
+    ok, reason = verify_player_record(audit['record'], audit['size'], audit['ships'], announced_root)
+    if ok:
+        return "[AUDIT] Opponent layout verified against its commitment."
+    return f"[AUDIT] Opponent layout FAILED verification: {reason}"
+
+
 def receive_messages(rfile):
     """Continuously receive and display messages from the server"""
+    announced_root = None
     while True:
         try:
             line = rfile.readline()
@@ -45,6 +66,11 @@ def receive_messages(rfile):
                     if not board_line or board_line.strip() == "":
                         break
                     print(board_line.strip())
+            elif line.startswith(COMMITMENT_PREFIX):
+                announced_root = line[len(COMMITMENT_PREFIX):]
+                print(line)
+            elif line.startswith(AUDIT_PREFIX):
+                print(check_audit(line, announced_root))
             else:
                 print(line)
         except Exception as e:
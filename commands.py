@@ -0,0 +1,93 @@
+"""
+commands.py
+
+Input parsing shared by the single- and two-player loops.
+ - coordinate_table(size): precomputed dict from every valid token ('B5', 'b5', ...) to (row, col)
+ - parse_command(text, size): one dict lookup for the usual case, returning (kind, arg)
+ - lookup_coordinate(token, size): (row, col) or ValueError, for ship placement prompts
+
+Nothing here writes to a socket; errors come back as (ERROR, message) for the caller to send.
+"""
+
+from functools import lru_cache
+
+from engine import FIRE, QUIT
+
+DPRIV = 'dpriv'
+DPUB = 'dpub'
+HELP = 'help'
+ERROR = 'error'
+
+# Command word -> (kind, arg), with the usual spellings precomputed so dispatch is one lookup
+COMMANDS = {}
+for _name in (QUIT, DPRIV, DPUB, HELP):
+    for _variant in (_name, _name.upper(), _name.capitalize()):
+        COMMANDS[_variant] = (_name, None)
+
+
+@lru_cache(maxsize=None)
+def coordinate_table(size):
+    """
+    Map every valid coordinate token on a size x size board to a zero-based (row, col).
+    Example (size=10): 'A1' => (0, 0), 'c10' => (2, 9)
+    """
+    table = {}
+    for r in range(size):
+        letter = chr(ord('A') + r)
+        for c in range(size):
+            digits = str(c + 1)
+            table[letter + digits] = table[letter.lower() + digits] = (r, c)
+    return table
+
+
+def coordinate_error(token, size):
+    """
+    Explain why 'token' is not a valid coordinate on a size x size board.
+    Only used on the slow path, after the table lookup has failed.
+    """
+    last_row = chr(ord('A') + size - 1)
+    hint = " Please enter a valid coordinate (e.g. B5)"
+    if len(token) < 2:
+        return "Coordinate too short." + hint
+    if not ('A' <= token[0].upper() <= last_row):
+        return f"Row must be a letter from A-{last_row}." + hint
+    return f"Column must be a number from 1 to {size}." + hint
+
+
+def lookup_coordinate(token, size):
+    """
+    Return (row, col) for 'token', or raise ValueError explaining what is wrong with it.
+    """
+    token = token.strip()
+    table = coordinate_table(size)
+    coord = table.get(token)
+    if coord is None:
+        coord = table.get(token.upper().replace(' ', ''))
+    if coord is None:
+        raise ValueError(coordinate_error(token, size))
+    return coord
+
+
+def parse_command(text, size):
+    """
+    Classify one line of player input. Returns one of:
+      - (FIRE, (row, col))
+      - (QUIT | DPRIV | DPUB | HELP, None)
+      - (ERROR, message)
+    """
+    token = text.strip()
+    command = COMMANDS.get(token)
+    if command is not None:
+        return command
+    coord = coordinate_table(size).get(token)
+    if coord is not None:
+        return (FIRE, coord)
+
+    # Slow path: odd casing or stray spaces (e.g. 'QuIt', 'b 5')
+    command = COMMANDS.get(token.lower())
+    if command is not None:
+        return command
+    try:
+        return (FIRE, lookup_coordinate(token, size))
+    except ValueError as e:
+        return (ERROR, str(e))
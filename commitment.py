@@ -0,0 +1,268 @@
+"""
+commitment.py
+
+Optional commit/reveal mode, so a match can be audited without trusting whoever holds the boards.
+ - LayoutCommitment (owner side): built right after placement. Derives a salt per cell from a
+   secret master salt, commits to every cell (which ship covers it, or water), and publishes
+   one root digest. Ship names are part of each cell commitment, so ships of equal length
+   cannot be swapped at reveal time.
+ - CommitRevealAudit (verifier side): stores each player's root, logs every fire_at result,
+   including 'already_shot' (an append, no hashing during play), and at game end checks the
+   revealed layout and the whole shot log in one batched pass.
+
+Per-cell commitments also allow an immediate spot check: open_cell() reveals one cell's salt
+(not the master salt), and verify_cell() checks it against the published digests.
+
+Auditing without trusting the host:
+ - At placement the server sends each client its opponent's root:
+       [INFO] Opponent layout commitment: <root hex>
+ - At game end it sends each client its opponent's player_record() as one JSON line:
+       [AUDIT] {"size": ..., "ships": [...], "record": {...}}
+   client.py checks it with verify_player_record(), passing the root announced at placement,
+   and prints its own verdict. A careful client should also compare record["shots"] with
+   the results it was shown during play.
+ - With an audit log path, the server also writes the whole match_record() as JSON.
+   Anyone can re-check it offline:
+       python commitment.py audit.json
+"""
+
+import secrets
+from hashlib import blake2b
+
+DIGEST_SIZE = 16
+
+
+def _cell_salt(master_salt, index):
+    return blake2b(index.to_bytes(2, 'big'), key=master_salt, digest_size=DIGEST_SIZE).digest()
+
+
+def _cell_digest(cell_salt, ship_name):
+    # The salt has a fixed length, so salt + name is unambiguous; water commits to the empty name
+    return blake2b(cell_salt + (ship_name or '').encode('utf-8'), digest_size=DIGEST_SIZE).digest()
+
+
+def _root(cell_digests):
+    return blake2b(b''.join(cell_digests), digest_size=32).digest()
+
+
+def layout_of(board):
+    """
+    Snapshot a freshly placed board as [(ship_name, ((r, c), ...)), ...].
+    Must be taken before any shots, since Board.placed_ships shrinks as ships are hit.
+    """
+    return [(ship['name'], tuple(sorted(ship['positions']))) for ship in board.placed_ships]
+
+
+def cell_ships(layout, size):
+    """
+    One entry per cell: the name of the ship in 'layout' covering it, or None for water.
+    """
+    cells = [None] * (size * size)
+    for name, positions in layout:
+        for r, c in positions:
+            cells[r * size + c] = name
+    return cells
+
+
+class LayoutCommitment:
+    """
+    Owner-side commitment to a board's ship layout.
+      - root: the digest to publish at placement time
+      - cell_digests: per-cell commitments (may be published too, for spot checks)
+    """
+
+    def __init__(self, board, master_salt=None):
+        self.size = board.size
+        self.layout = layout_of(board)
+        self.master_salt = master_salt if master_salt is not None else secrets.token_bytes(32)
+        cells = cell_ships(self.layout, self.size)
+        self.cell_salts = [_cell_salt(self.master_salt, i) for i in range(self.size * self.size)]
+        self.cell_digests = [_cell_digest(salt, cells[i]) for i, salt in enumerate(self.cell_salts)]
+        self.root = _root(self.cell_digests)
+        self._cells = cells
+
+    def open_cell(self, row, col):
+        """
+        Reveal a single cell: (cell_salt, ship_name or None). Does not reveal any other cell.
+        """
+        i = row * self.size + col
+        return self.cell_salts[i], self._cells[i]
+
+    def reveal(self):
+        """
+        Everything the verifier needs at game end: (master_salt, layout).
+        """
+        return self.master_salt, self.layout
+
+
+def verify_cell(cell_digests, size, row, col, cell_salt, ship_name):
+    """
+    Check one opened cell (ship name, or None for water) against published per-cell digests.
+    """
+    return _cell_digest(cell_salt, ship_name) == cell_digests[row * size + col]
+
+
+class CommitRevealAudit:
+    """
+    Verifier side. Players are identified by index; record() is called with the player
+    whose board was fired at (the defender).
+      - size: board size
+      - ships: the fleet every layout must contain, e.g. battleship.SHIPS
+    """
+
+    def __init__(self, size, ships):
+        self.size = size
+        self.fleet = sorted(ships)
+        self.roots = {}
+        self.shots = {}
+
+    def commit(self, player, root):
+        self.roots[player] = root
+        self.shots[player] = []
+
+    def record(self, player, row, col, result, sunk_name=None):
+        """
+        Log a reported fire_at result ('hit', 'miss' or 'already_shot') against 'player''s board.
+        Verified later by verify().
+        """
+        self.shots[player].append((row, col, result, sunk_name))
+
+    def verify(self, player, master_salt, layout):
+        """
+        Check a revealed layout against the commitment and the logged results.
+        Returns (True, None) or (False, reason).
+        """
+        size = self.size
+        if player not in self.roots:
+            return False, "no commitment on record"
+
+        # The layout must be a legal placement of the agreed fleet
+        if sorted((name, len(positions)) for name, positions in layout) != self.fleet:
+            return False, "fleet does not match the agreed ships"
+        seen = set()
+        for name, positions in layout:
+            rows = {r for r, _ in positions}
+            cols = {c for _, c in positions}
+            if len(rows) != 1 and len(cols) != 1:
+                return False, f"{name} is not in a straight line"
+            line = sorted(c for _, c in positions) if len(rows) == 1 else sorted(r for r, _ in positions)
+            if line != list(range(line[0], line[0] + len(line))):
+                return False, f"{name} has gaps"
+            for r, c in positions:
+                if not (0 <= r < size and 0 <= c < size):
+                    return False, f"{name} is off the board"
+                if (r, c) in seen:
+                    return False, f"{name} overlaps another ship"
+                seen.add((r, c))
+
+        # One pass over every cell to rebuild the root
+        cells = cell_ships(layout, size)
+        digests = [_cell_digest(_cell_salt(master_salt, i), cells[i]) for i in range(size * size)]
+        if _root(digests) != self.roots[player]:
+            return False, "layout does not match the commitment"
+
+        # Replay the logged results against the revealed layout
+        ship_at = {}
+        remaining = {}
+        for name, positions in layout:
+            remaining[name] = len(positions)
+            for cell in positions:
+                ship_at[cell] = name
+        fired = set()
+        for row, col, result, sunk_name in self.shots[player]:
+            cell = (row, col)
+            # 'already_shot' is only legal for a cell fired at earlier, and only there
+            if (result == 'already_shot') != (cell in fired):
+                return False, f"wrong repeat-shot report at {cell}"
+            if result == 'already_shot':
+                continue
+            fired.add(cell)
+            name = ship_at.get(cell)
+            if (result == 'hit') != (name is not None):
+                return False, f"wrong result reported at {cell}"
+            if name is None:
+                continue
+            remaining[name] -= 1
+            expected_sunk = name if remaining[name] == 0 else None
+            if sunk_name != expected_sunk:
+                return False, f"wrong sunk report at {cell}"
+        return True, None
+
+
+def player_record(commitment, shots):
+    """
+    JSON-ready audit record for one board: the published root and per-cell digests, the
+    logged shots against it, and the reveal (master salt and layout).
+    """
+    master_salt, layout = commitment.reveal()
+    return {
+        'root': commitment.root.hex(),
+        'cell_digests': [digest.hex() for digest in commitment.cell_digests],
+        'shots': [list(shot) for shot in shots],
+        'master_salt': master_salt.hex(),
+        'layout': [[name, [list(cell) for cell in positions]] for name, positions in layout],
+    }
+
+
+def match_record(audit, commitments):
+    """
+    JSON-ready audit record for a whole match; commitments[p] is player p's LayoutCommitment.
+    """
+    return {
+        'size': audit.size,
+        'ships': [list(ship) for ship in audit.fleet],
+        'players': [player_record(commitments[p], audit.shots[p]) for p in range(len(commitments))],
+    }
+
+
+def verify_player_record(record, size, ships, expected_root=None):
+    """
+    Independently verify one player_record(). 'expected_root' is the root that was
+    announced before the first shot (as hex or bytes); pass it whenever you have it,
+    otherwise a host could publish a different commitment after the fact.
+    Returns (True, None) or (False, reason).
+    """
+    root = bytes.fromhex(record['root'])
+    if expected_root is not None:
+        if isinstance(expected_root, str):
+            expected_root = bytes.fromhex(expected_root)
+        if root != expected_root:
+            return False, "root differs from the one announced at placement"
+    if _root([bytes.fromhex(digest) for digest in record['cell_digests']]) != root:
+        return False, "cell digests do not match the root"
+
+    audit = CommitRevealAudit(size, [tuple(ship) for ship in ships])
+    audit.commit(0, root)
+    for row, col, result, sunk_name in record['shots']:
+        audit.record(0, row, col, result, sunk_name)
+    layout = [(name, tuple(tuple(cell) for cell in positions)) for name, positions in record['layout']]
+    return audit.verify(0, bytes.fromhex(record['master_salt']), layout)
+
+
+def verify_match_record(record):
+    """
+    Verify every player in a match_record(). Returns [(ok, reason), ...] in player order.
+    """
+    return [verify_player_record(player, record['size'], record['ships']) for player in record['players']]
+
+
+def main():
+    """
+    Offline auditor: python commitment.py audit.json
+    """
+    import json
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python commitment.py audit.json")
+        sys.exit(2)
+    with open(sys.argv[1]) as f:
+        record = json.load(f)
+    results = verify_match_record(record)
+    for p, (ok, reason) in enumerate(results):
+        print(f"Player {p + 1}: " + ("verified" if ok else f"FAILED: {reason}"))
+    sys.exit(0 if all(ok for ok, _ in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
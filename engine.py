@@ -0,0 +1,150 @@
+"""
+engine.py
+
+Pure rules engine for Battleship, with no socket I/O in it.
+ - GameEngine is a small state machine: apply(command) -> list of events
+ - Rule variants (ClassicRules, SalvoRules, ExtraShotOnHitRules) decide how many
+   shots a player gets per turn and when the turn passes
+ - Network front ends (battleship.py) and offline simulators both drive it directly
+
+Commands are plain tuples:
+    (FIRE, player, row, col)
+    (QUIT, player)
+
+Events are plain tuples of the form (kind, player, coord, detail):
+    (HIT, player, (r, c), sunk_ship_name or None)
+    (MISS, player, (r, c), None)
+    (ALREADY_SHOT, player, (r, c), None)
+    (TURN, next_player, None, shots_for_that_turn)
+    (GAME_OVER, winner, None, winner_moves)
+    (FORFEIT, player, None, None)
+"""
+
+# Commands
+FIRE = 'fire'
+QUIT = 'quit'
+
+# Events (the first three match the results returned by Board.fire_at)
+HIT = 'hit'
+MISS = 'miss'
+ALREADY_SHOT = 'already_shot'
+TURN = 'turn'
+GAME_OVER = 'game_over'
+FORFEIT = 'forfeit'
+
+
+class ClassicRules:
+    """
+    One shot per turn; the turn always passes after a valid shot.
+    """
+    name = 'classic'
+
+    def shots_per_turn(self, engine, player):
+        return 1
+
+    def shots_after(self, engine, player, result, shots_left):
+        """
+        Return how many shots 'player' has left after a shot with the given result.
+        """
+        return shots_left - 1
+
+
+class SalvoRules(ClassicRules):
+    """
+    One shot per ship still afloat in the firing player's own fleet.
+    """
+    name = 'salvo'
+
+    def shots_per_turn(self, engine, player):
+        return max(1, engine.fleets[player].ships_remaining())
+
+
+class ExtraShotOnHitRules(ClassicRules):
+    """
+    One shot per turn, but a hit earns the player another shot.
+    """
+    name = 'extra_shot'
+
+    def shots_after(self, engine, player, result, shots_left):
+        if result == HIT:
+            return shots_left
+        return shots_left - 1
+
+
+RULES = {rules.name: rules for rules in (ClassicRules(), SalvoRules(), ExtraShotOnHitRules())}
+
+
+class GameEngine:
+    """
+    Turn-based Battleship state machine.
+      - targets[p]: the Board player p fires at
+      - fleets[p]: the Board holding player p's own ships (used by SalvoRules);
+        defaults to targets[(p + 1) % n], which is the opponent's target in a
+        two-player game and the board itself in a single-player game
+      - turn: index of the player who must act next
+      - moves[p]: number of valid shots fired by player p
+
+    Boards only need fire_at(), all_ships_sunk(), ships_remaining() and a size attribute.
+    """
+    __slots__ = ('targets', 'fleets', 'rules', 'turn', 'shots_left', 'moves', 'over', 'winner')
+
+    def __init__(self, targets, rules=None, first_turn=0, fleets=None):
+        n = len(targets)
+        self.targets = list(targets)
+        self.fleets = list(fleets) if fleets is not None else [self.targets[(p + 1) % n] for p in range(n)]
+        if rules is None:
+            rules = RULES['classic']
+        elif isinstance(rules, str):
+            rules = RULES[rules]
+        self.rules = rules
+        self.turn = first_turn
+        self.moves = [0] * n
+        self.over = False
+        self.winner = None
+        self.shots_left = rules.shots_per_turn(self, first_turn)
+
+    def apply(self, command):
+        """
+        Apply a single command and return the list of events it produced.
+        Raises ValueError for commands that are illegal in the current state.
+        """
+        kind = command[0]
+        player = command[1]
+        if self.over:
+            raise ValueError("Game is already over")
+        if player != self.turn:
+            raise ValueError(f"It is not player {player}'s turn")
+
+        if kind == QUIT:
+            self.over = True
+            if len(self.targets) > 1:
+                self.winner = (player + 1) % len(self.targets)
+            return [(FORFEIT, player, None, None)]
+        if kind != FIRE:
+            raise ValueError(f"Unknown command: {kind}")
+
+        row, col = command[2], command[3]
+        target = self.targets[player]
+        if not (0 <= row < target.size and 0 <= col < target.size):
+            raise ValueError("Coordinate is off the board")
+
+        result, sunk_name = target.fire_at(row, col)
+        if result == ALREADY_SHOT:
+            # Re-firing at a known cell costs nothing; the player simply tries again
+            return [(ALREADY_SHOT, player, (row, col), None)]
+
+        self.moves[player] += 1
+        events = [(result, player, (row, col), sunk_name)]
+
+        if target.all_ships_sunk():
+            self.over = True
+            self.winner = player
+            events.append((GAME_OVER, player, None, self.moves[player]))
+            return events
+
+        self.shots_left = self.rules.shots_after(self, player, result, self.shots_left)
+        if self.shots_left <= 0:
+            self.turn = (player + 1) % len(self.targets)
+            self.shots_left = self.rules.shots_per_turn(self, self.turn)
+            events.append((TURN, self.turn, None, self.shots_left))
+        return events
@@ -0,0 +1,106 @@
+"""
+limits.py
+
+Per-connection protection against clients that flood the server with input.
+ - TokenBucket: classic token bucket (rate tokens/second, up to 'burst' saved up)
+ - LimitedReader: wraps a connection's binary rfile with a line-length cap, a rate limit,
+   and lenient decoding (undecodable lines are dropped rather than raising)
+ - MAX_PENDING / SEND_TIMEOUT: outbound limits for outbox.Outbox, which drops a client
+   that stops reading instead of blocking on it
+
+LimitedReader never drops well-formed lines; a client that sends faster than the rate
+simply waits, which leaves its data sitting in the kernel socket buffer until TCP
+flow control pushes back on the client.
+"""
+
+import time
+
+MAX_LINE = 64                  # longest command we accept, in bytes (excluding newline)
+LINES_PER_SECOND = 10
+BURST = 20
+MAX_PENDING = 64 * 1024        # outbound bytes queued before Outbox drains eagerly
+SEND_TIMEOUT = 10.0            # seconds a client may leave its output unread before it is dropped
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter.
+      - rate: tokens added per second
+      - burst: bucket capacity (and the initial number of tokens)
+    """
+
+    def __init__(self, rate=LINES_PER_SECOND, burst=BURST, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.last = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+
+    def try_take(self):
+        """
+        Take one token if available. Returns True on success, False if the bucket is empty.
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def wait_time(self):
+        """
+        Seconds until the next token is available (0 if one is available now).
+        """
+        self._refill()
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, sleep=time.sleep):
+        """
+        Take one token, sleeping until one is available.
+        """
+        while not self.try_take():
+            sleep(self.wait_time())
+
+
+class LimitedReader:
+    """
+    File-like wrapper around a connection's rfile, exposing a text readline() only.
+      - rfile: ideally binary (conn.makefile('rb')), so max_line bounds bytes and decoding
+        is done here; text rfiles also work, with max_line counting characters
+      - max_line: longer lines are discarded and returned as an empty line
+      - bucket: TokenBucket consulted once per line
+    Lines that are not valid UTF-8 are also discarded and returned as an empty line.
+    """
+
+    def __init__(self, rfile, bucket=None, max_line=MAX_LINE):
+        self.rfile = rfile
+        self.bucket = bucket if bucket is not None else TokenBucket()
+        self.max_line = max_line
+        self.dropped_lines = 0
+
+    def readline(self):
+        self.bucket.take()
+
+        line = self.rfile.readline(self.max_line + 1)
+        newline = b'\n' if isinstance(line, bytes) else '\n'
+        if len(line) > self.max_line and not line.endswith(newline):
+            # Over-long line: throw away the rest of it in bounded chunks
+            while line and not line.endswith(newline):
+                line = self.rfile.readline(self.max_line + 1)
+            self.dropped_lines += 1
+            return '\n' if line else ''
+
+        if isinstance(line, bytes):
+            try:
+                return line.decode('utf-8')
+            except UnicodeDecodeError:
+                self.dropped_lines += 1
+                return '\n'
+        return line
+
+    def close(self):
+        self.rfile.close()
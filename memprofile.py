@@ -0,0 +1,56 @@
+"""
+memprofile.py
+
+Measures how many bytes one live match keeps resident, to size hosts from real numbers.
+A "live match" here is what the server holds between turns: two boards with ships placed
+and a few shots fired, plus the engine.GameEngine driving them.
+
+Usage:
+    python memprofile.py [matches]
+"""
+
+import random as rd
+import sys
+import tracemalloc
+
+from battleship import Board, CompactBoard, BOARD_SIZE
+from engine import GameEngine, FIRE
+
+
+def make_match(board_cls, rng, shots=10):
+    board1 = board_cls(BOARD_SIZE)
+    board2 = board_cls(BOARD_SIZE)
+    board1.place_ships_randomly(rng=rng)
+    board2.place_ships_randomly(rng=rng)
+    engine = GameEngine([board2, board1])
+    for i in range(shots):
+        row, col = divmod(i * 7 % (BOARD_SIZE * BOARD_SIZE), BOARD_SIZE)
+        engine.apply((FIRE, engine.turn, row, col))
+    return engine
+
+
+def bytes_per_match(board_cls, matches=1000, seed=0):
+    """
+    Build 'matches' live matches with board_cls and return the average bytes each one holds.
+    Placement is seeded, so the same arguments always measure the same layouts.
+    """
+    rngs = [rd.Random(seed + i) for i in range(matches)]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        live = [make_match(board_cls, rng) for rng in rngs]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list holding the matches is bookkeeping, not part of any match
+    return (after - before - sys.getsizeof(live)) / matches
+
+
+def main():
+    matches = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for board_cls in (Board, CompactBoard):
+        print(f"{board_cls.__name__:12} {bytes_per_match(board_cls, matches):10.0f} bytes/match")
+
+
+if __name__ == "__main__":
+    main()
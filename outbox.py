@@ -0,0 +1,148 @@
+"""
+outbox.py
+
+Outbound message batching for the online game loops.
+ - Outbox collects every message produced during a turn as encoded chunks
+ - drain() hands them to the socket with a single sendmsg() scatter call
+   (falling back to one write()+flush() for plain file-like objects)
+
+Outbox exposes write()/flush() so it can be passed anywhere a wfile is expected;
+flush() sends whatever is queued, like on any other wfile. The game loops never call
+flush() themselves: they only write(), and call drain() once at the end of the turn,
+right before they block waiting for input.
+
+Backpressure: with a 'limit', write() drains as soon as that many bytes are queued, and
+with a 'send_timeout', drain() waits at most that long for the client to make room.
+A client that doesn't make room in time has its connection dropped: the queue is discarded,
+later writes are ignored, and the socket is shut down so the game loop reads EOF
+(which it treats as the player quitting) instead of blocking on that client forever.
+"""
+
+import os
+import selectors
+import socket
+import time
+
+# Most platforms cap the number of iovecs per sendmsg() call at 1024
+IOV_MAX = getattr(os, 'IOV_MAX', None) or 1024
+# Per-call non-blocking send, so a full socket buffer never blocks past send_timeout
+_DONTWAIT = getattr(socket, 'MSG_DONTWAIT', 0)
+
+
+class Outbox:
+    """
+    Per-connection outbound buffer.
+      - sink: a socket (anything with sendmsg) or a file-like object with write()/flush()
+      - limit: optional cap on queued bytes before write() drains eagerly
+      - send_timeout: optional seconds a drain() may wait on a socket before dropping the client
+    """
+
+    def __init__(self, sink, encoding='utf-8', limit=None, send_timeout=None):
+        self.sink = sink
+        self.encoding = encoding
+        self.limit = limit
+        self.send_timeout = send_timeout
+        self.closed = False
+        self._selector = None
+        self._chunks = []
+        self._pending = 0
+        self._sendmsg = getattr(sink, 'sendmsg', None)
+
+    @classmethod
+    def wrap(cls, wfile):
+        """
+        Return wfile itself if it is already an Outbox, otherwise an Outbox around it.
+        """
+        return wfile if isinstance(wfile, cls) else cls(wfile)
+
+    def write(self, text):
+        if self.closed:
+            return len(text)
+        data = text.encode(self.encoding)
+        self._chunks.append(data)
+        self._pending += len(data)
+        if self.limit is not None and self._pending >= self.limit:
+            self.drain()
+        return len(text)
+
+    def flush(self):
+        """
+        Send everything queued so far, for callers that write, flush, then block on input.
+        """
+        self.drain()
+
+    def pending(self):
+        """
+        Number of bytes queued but not yet sent.
+        """
+        return self._pending
+
+    def drain(self):
+        """
+        Send everything queued so far. Returns the number of bytes sent
+        (0 if the connection is, or gets, dropped).
+        """
+        if not self._chunks:
+            return 0
+        chunks, self._chunks = self._chunks, []
+        total, self._pending = self._pending, 0
+
+        if self._sendmsg is None:
+            # Not a socket (e.g. a makefile() wrapper or StringIO): one write, one flush
+            self.sink.write(b''.join(chunks).decode(self.encoding))
+            self.sink.flush()
+            return total
+
+        views = [memoryview(chunk) for chunk in chunks]
+        deadline = None if self.send_timeout is None else time.monotonic() + self.send_timeout
+        while views:
+            try:
+                sent = self._sendmsg(views[:IOV_MAX], (), _DONTWAIT)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                # Peer reset or closed the connection
+                self._drop()
+                return 0
+            # Drop whatever was fully sent and slice into a partially-sent chunk
+            i = 0
+            while i < len(views) and sent >= len(views[i]):
+                sent -= len(views[i])
+                i += 1
+            del views[:i]
+            if views and sent:
+                views[0] = views[0][sent:]
+            elif views:
+                # Socket buffer is full: wait for the client to read, up to the deadline
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._drop()
+                    return 0
+                self._wait_writable(remaining)
+        return total
+
+    def _wait_writable(self, timeout):
+        """
+        Block until the socket can take more data or 'timeout' seconds pass.
+        Uses selectors (epoll/kqueue/poll) rather than select(), which fails on
+        descriptors >= FD_SETSIZE once a server holds many connections.
+        """
+        if self._selector is None:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self.sink, selectors.EVENT_WRITE)
+        self._selector.select(timeout)
+
+    def _drop(self):
+        """
+        Give up on a client that isn't reading: discard output and shut the socket down.
+        """
+        self.closed = True
+        self._chunks = []
+        self._pending = 0
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        try:
+            self.sink.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
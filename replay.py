@@ -0,0 +1,131 @@
+"""
+replay.py
+
+Record/replay harness for reproducible performance runs.
+ - RecordingReader: wraps a live rfile and logs every line the client sent
+ - replay_single() / replay_two_player(): feed recorded input scripts to the online game
+   loops through in-memory rfile/wfile objects, with a seeded RNG per match
+ - profile(): repeat a replay and report CPU time and allocations
+
+The same script and seed always produce the same transcript, so the transcript digest
+printed by the CLI shows that two versions really ran the same workload.
+
+Usage:
+    python replay.py single  script.txt [--seed N] [--repeat N] [--rules classic]
+    python replay.py two     p1.txt p2.txt [--seed N] [--repeat N] [--rules classic]
+
+Recording a live game: python server.py --record DIR writes DIR/player1.txt and
+DIR/player2.txt and prints the seed to replay them with:
+    python replay.py two DIR/player1.txt DIR/player2.txt --seed N
+"""
+
+import argparse
+import io
+import random as rd
+import time
+import tracemalloc
+from hashlib import sha256
+
+from battleship import run_single_player_game_online, run_two_player_game_online, Board, CompactBoard
+
+
+class RecordingReader:
+    """
+    rfile wrapper that appends every line read to 'log' (any object with write()).
+    """
+
+    def __init__(self, rfile, log):
+        self.rfile = rfile
+        self.log = log
+
+    def readline(self, *args):
+        line = self.rfile.readline(*args)
+        if line:
+            self.log.write(line if line.endswith('\n') else line + '\n')
+        return line
+
+
+def load_script(path):
+    with open(path) as f:
+        return f.read()
+
+
+def replay_single(script, seed=0, rules=None, board_cls=Board):
+    """
+    Replay one single-player input script. Returns the full server transcript.
+    """
+    wfile = io.StringIO()
+    run_single_player_game_online(io.StringIO(script), wfile, rules=rules, board_cls=board_cls,
+                                  rng=rd.Random(seed))
+    return wfile.getvalue()
+
+
+def replay_two_player(script1, script2, seed=0, rules=None, board_cls=Board):
+    """
+    Replay a pair of two-player input scripts. Returns (transcript1, transcript2).
+    """
+    wfile1, wfile2 = io.StringIO(), io.StringIO()
+    run_two_player_game_online(io.StringIO(script1), wfile1, io.StringIO(script2), wfile2,
+                               rules=rules, board_cls=board_cls, rng=rd.Random(seed))
+    return wfile1.getvalue(), wfile2.getvalue()
+
+
+def profile(replay, repeat=10):
+    """
+    Run 'replay' (a no-argument callable) 'repeat' times.
+    Returns a dict with the best and mean CPU seconds per run, the peak and retained traced
+    memory of one extra traced run, and a digest of its output.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.process_time()
+        replay()
+        times.append(time.process_time() - start)
+
+    # Allocations are measured separately so tracing doesn't skew the CPU numbers
+    tracemalloc.start()
+    try:
+        result = replay()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'cpu_best': min(times),
+        'cpu_mean': sum(times) / len(times),
+        'peak_bytes': peak,
+        'retained_bytes': retained,
+        'digest': sha256(repr(result).encode()).hexdigest()[:16],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Battleship input scripts.")
+    parser.add_argument('mode', choices=['single', 'two'])
+    parser.add_argument('scripts', nargs='+')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--rules', default=None)
+    parser.add_argument('--compact', action='store_true', help="use CompactBoard")
+    args = parser.parse_args()
+
+    board_cls = CompactBoard if args.compact else Board
+    scripts = [load_script(path) for path in args.scripts]
+    if args.mode == 'single':
+        def replay():
+            return replay_single(scripts[0], args.seed, args.rules, board_cls)
+    else:
+        if len(scripts) != 2:
+            parser.error("two-player mode needs two scripts")
+
+        def replay():
+            return replay_two_player(scripts[0], scripts[1], args.seed, args.rules, board_cls)
+
+    stats = profile(replay, args.repeat)
+    print(f"cpu best {stats['cpu_best'] * 1000:.3f} ms, mean {stats['cpu_mean'] * 1000:.3f} ms")
+    print(f"peak {stats['peak_bytes']} bytes, retained {stats['retained_bytes']} bytes")
+    print(f"transcript {stats['digest']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,19 @@ The core issue is in how the client handles incoming messages.
 However, if you want to support multiple clients (i.e. progress through further Tiers), you'll need concurrency here too.
 """
 
+import argparse
+import os
+import random as rd
+import secrets
 import socket
 import threading
 import time
 import uuid
 from collections import deque
 from battleship import run_single_player_game_online, run_two_player_game_online
+from outbox import Outbox
+from limits import LimitedReader, TokenBucket, MAX_PENDING, SEND_TIMEOUT
+from replay import RecordingReader
 
 HOST = '127.0.0.1'
 PORT = 6000
@@ -33,6 +40,23 @@ GAMES = {}
 #
 
 def main():
+    parser = argparse.ArgumentParser(description="Battleship server.")
+    parser.add_argument('--commit-reveal', action='store_true',
+                        help="commit to both layouts at placement and send each client the reveal at game end")
+    parser.add_argument('--audit-log', metavar='PATH',
+                        help="with --commit-reveal, save the match's audit record (check it with commitment.py)")
+    parser.add_argument('--record', metavar='DIR',
+                        help="write each player's input to DIR/player1.txt and DIR/player2.txt for replay.py")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed placement and turn order (chosen and printed automatically with --record)")
+    args = parser.parse_args()
+
+    seed = args.seed
+    if seed is None and args.record:
+        # A recording only replays to the same game under the same seed
+        seed = secrets.randbits(32)
+    rng = None if seed is None else rd.Random(seed)
+
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
         s.bind((HOST, PORT))
         s.listen(10)
@@ -48,12 +72,29 @@ def main():
         print(f"[INFO] Player 2 connected from {addr2}")
 
         with conn1, conn2:
-            rfile1 = conn1.makefile('r')
-            wfile1 = conn1.makefile('w')
-            rfile2 = conn2.makefile('r')
-            wfile2 = conn2.makefile('w')
-
-            run_two_player_game_online(rfile1, wfile1, rfile2, wfile2)
+            # Write straight to the sockets so each turn goes out in one sendmsg() call;
+            # a client that leaves its output unread for SEND_TIMEOUT is dropped (and forfeits)
+            wfile1 = Outbox(conn1, limit=MAX_PENDING, send_timeout=SEND_TIMEOUT)
+            wfile2 = Outbox(conn2, limit=MAX_PENDING, send_timeout=SEND_TIMEOUT)
+            # Cap line length (in bytes) and input rate per connection; decoding happens in LimitedReader
+            rfile1 = LimitedReader(conn1.makefile('rb'), TokenBucket())
+            rfile2 = LimitedReader(conn2.makefile('rb'), TokenBucket())
+
+            logs = []
+            if args.record:
+                # Record outside the LimitedReader, so the scripts hold exactly the lines the game saw
+                os.makedirs(args.record, exist_ok=True)
+                logs = [open(os.path.join(args.record, f"player{n}.txt"), 'w', buffering=1) for n in (1, 2)]
+                rfile1 = RecordingReader(rfile1, logs[0])
+                rfile2 = RecordingReader(rfile2, logs[1])
+                print(f"[INFO] Recording input to {args.record} (replay with --seed {seed})")
+
+            try:
+                run_two_player_game_online(rfile1, wfile1, rfile2, wfile2, rng=rng,
+                                           commit_reveal=args.commit_reveal, audit_log=args.audit_log)
+            finally:
+                for log in logs:
+                    log.close()
             print("[INFO] Game finished. Closing connections.")
 
     while True:
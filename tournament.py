@@ -0,0 +1,260 @@
+"""
+tournament.py
+
+Runs bracketed or round-robin Battleship events between bots, without sockets.
+ - Bots: RandomBot, SweepBot and HuntBot; any class with next_shot(grid) -> (row, col) works
+ - Schedules: round_robin_pairings() and single-elimination brackets (with byes)
+ - run_tournament() plays matches on engine.GameEngine across a process pool and
+   folds each result into a Standings table as soon as it arrives
+
+A roster is a list of (name, bot_factory) pairs. Factories are called once per match
+with a random.Random instance, and must be picklable (e.g. top-level classes) so
+matches can run in worker processes.
+
+Example:
+    roster = [(f"hunt-{i}", HuntBot) for i in range(500)] + [(f"rand-{i}", RandomBot) for i in range(500)]
+    standings = run_tournament(roster, fmt='elimination', workers=8)
+    print(standings.table()[:10])
+"""
+
+import random as rd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+
+from battleship import Board, BOARD_SIZE
+from engine import GameEngine, FIRE, QUIT, GAME_OVER, FORFEIT
+
+ROUND_ROBIN = 'round_robin'
+ELIMINATION = 'elimination'
+
+
+class RandomBot:
+    """
+    Fires at every cell exactly once, in random order.
+    """
+
+    def __init__(self, rng, size=BOARD_SIZE):
+        self.cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(self.cells)
+
+    def next_shot(self, grid):
+        return self.cells.pop()
+
+
+class SweepBot:
+    """
+    Fires row by row, left to right.
+    """
+
+    def __init__(self, rng, size=BOARD_SIZE):
+        self.size = size
+        self.next_cell = 0
+
+    def next_shot(self, grid):
+        row, col = divmod(self.next_cell, self.size)
+        self.next_cell += 1
+        return row, col
+
+
+class HuntBot:
+    """
+    Hunt/target strategy: finish off known hits first, otherwise fire at random on a
+    checkerboard (every ship is at least 2 long, so half the cells are enough to find them).
+    """
+
+    def __init__(self, rng, size=BOARD_SIZE):
+        self.size = size
+        cells = [(r, c) for r in range(size) for c in range(size)]
+        rng.shuffle(cells)
+        # Checkerboard cells first, the rest only if needed
+        self.hunt = [cell for cell in cells if (cell[0] + cell[1]) % 2 == 1] + \
+                    [cell for cell in cells if (cell[0] + cell[1]) % 2 == 0]
+
+    def next_shot(self, grid):
+        size = self.size
+        for r in range(size):
+            row = grid[r]
+            for c in range(size):
+                if row[c] != 'X':
+                    continue
+                for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)):
+                    if 0 <= nr < size and 0 <= nc < size and grid[nr][nc] == '.':
+                        return nr, nc
+        while True:
+            row, col = self.hunt.pop()
+            if grid[row][col] == '.':
+                return row, col
+
+
+def play_match(entry_a, entry_b, rules='classic', seed=None, board_cls=Board):
+    """
+    Play one bot-vs-bot match on the rules engine.
+    Returns (winner_name, loser_name, winner_moves).
+
+    A bot that raises, fires off the board, or keeps re-firing at known cells
+    (more than size * size attempts) forfeits the match.
+    """
+    rng = rd.Random(seed)
+    names = (entry_a[0], entry_b[0])
+    boards = (board_cls(BOARD_SIZE), board_cls(BOARD_SIZE))
+    for board in boards:
+        board.place_ships_randomly(rng=rd.Random(rng.getrandbits(64)))
+    bots = (entry_a[1](rd.Random(rng.getrandbits(64))), entry_b[1](rd.Random(rng.getrandbits(64))))
+
+    engine = GameEngine([boards[1], boards[0]], rules=rules, first_turn=rng.randint(0, 1))
+    attempts = [0, 0]
+    limit = BOARD_SIZE * BOARD_SIZE
+    while not engine.over:
+        player = engine.turn
+        attempts[player] += 1
+        try:
+            if attempts[player] > limit:
+                raise ValueError("too many shots")
+            row, col = bots[player].next_shot(engine.targets[player].display_grid)
+            events = engine.apply((FIRE, player, row, col))
+        except Exception:
+            events = engine.apply((QUIT, player))
+
+        for kind, who, _, detail in events:
+            if kind == GAME_OVER:
+                return names[who], names[1 - who], detail
+            elif kind == FORFEIT:
+                return names[1 - who], names[who], engine.moves[1 - who]
+
+
+def _play_batch(batch):
+    """
+    Worker entry point: play a list of (entry_a, entry_b, rules, seed) matches.
+    Batching keeps inter-process traffic to one round trip per batch instead of per match.
+    """
+    return [play_match(*match) for match in batch]
+
+
+def round_robin_pairings(roster):
+    """
+    Every entrant plays every other entrant once.
+    """
+    return list(combinations(roster, 2))
+
+
+def elimination_pairings(roster, had_bye=()):
+    """
+    Pair up one bracket round in seeding order. Returns (pairings, bye) where 'bye' is the
+    entrant that advances without playing when the round has an odd number of entrants.
+    The bye goes to the lowest-seeded entrant whose name is not in 'had_bye', so it
+    rotates instead of carrying the same entrant through every odd round.
+    """
+    if len(roster) % 2 == 0:
+        bye = None
+        players = roster
+    else:
+        candidates = [i for i, entry in enumerate(roster) if entry[0] not in had_bye]
+        index = candidates[-1] if candidates else len(roster) - 1
+        bye = roster[index]
+        players = roster[:index] + roster[index + 1:]
+    pairings = [(players[i], players[i + 1]) for i in range(0, len(players), 2)]
+    return pairings, bye
+
+
+class Standings:
+    """
+    Running win/loss table, updated one result at a time as matches complete.
+    Every name passed in is listed by table(), even if it never plays:
+
+    >>> standings = Standings(name for name in ('a', 'b', 'c'))
+    >>> standings.record('a', 'b', 40)
+    >>> [row[:3] for row in standings.table()]
+    [('a', 1, 0), ('c', 0, 0), ('b', 0, 1)]
+    """
+
+    def __init__(self, names=()):
+        names = list(names)
+        self.wins = {name: 0 for name in names}
+        self.losses = {name: 0 for name in names}
+        self.moves = {name: 0 for name in names}
+        self.matches = 0
+
+    def record(self, winner, loser, winner_moves):
+        self.wins[winner] = self.wins.get(winner, 0) + 1
+        self.losses[loser] = self.losses.get(loser, 0) + 1
+        self.moves[winner] = self.moves.get(winner, 0) + winner_moves
+        self.wins.setdefault(loser, 0)
+        self.losses.setdefault(winner, 0)
+        self.moves.setdefault(loser, 0)
+        self.matches += 1
+
+    def table(self):
+        """
+        Return [(name, wins, losses, avg_moves_per_win), ...], best first
+        (most wins, then fewest losses, then fewest moves per win).
+        """
+        rows = []
+        for name, wins in self.wins.items():
+            avg_moves = self.moves[name] / wins if wins else 0.0
+            rows.append((name, wins, self.losses[name], avg_moves))
+        rows.sort(key=lambda row: (-row[1], row[2], row[3]))
+        return rows
+
+
+def _run_round(executor, pairings, rules, seed, standings, batch_size, on_result):
+    """
+    Play one set of independent pairings in parallel; return the winners' names in completion order.
+    """
+    matches = [(a, b, rules, None if seed is None else seed + i) for i, (a, b) in enumerate(pairings)]
+    batches = [matches[i:i + batch_size] for i in range(0, len(matches), batch_size)]
+    if executor is None:
+        results_iter = (_play_batch(batch) for batch in batches)
+    else:
+        futures = [executor.submit(_play_batch, batch) for batch in batches]
+        results_iter = (future.result() for future in as_completed(futures))
+
+    winners = []
+    for results in results_iter:
+        for winner, loser, winner_moves in results:
+            standings.record(winner, loser, winner_moves)
+            winners.append(winner)
+            if on_result is not None:
+                on_result(winner, loser, winner_moves, standings)
+    return winners
+
+
+def run_tournament(roster, fmt=ROUND_ROBIN, workers=None, rules='classic', seed=None,
+                   batch_size=64, on_result=None):
+    """
+    Run a whole event and return its Standings.
+      - roster: list of (name, bot_factory); names must be unique
+      - fmt: ROUND_ROBIN or ELIMINATION (single elimination, byes for odd rounds)
+      - workers: size of the process pool; None uses os.cpu_count(), 0 runs everything in-process
+      - rules: engine rule variant used for every match
+      - seed: base seed for placement, turn order and bot RNGs (match i uses seed + i)
+      - batch_size: matches sent to a worker per task
+      - on_result: optional callback(winner, loser, winner_moves, standings) per finished match
+    """
+    roster = list(roster)
+    standings = Standings(name for name, _ in roster)
+    if fmt not in (ROUND_ROBIN, ELIMINATION):
+        raise ValueError(f"Unknown tournament format: {fmt}")
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers != 0 else None
+    try:
+        if fmt == ROUND_ROBIN:
+            _run_round(executor, round_robin_pairings(roster), rules, seed, standings, batch_size, on_result)
+            return standings
+
+        remaining = roster
+        had_bye = set()
+        round_no = 0
+        while len(remaining) > 1:
+            pairings, bye = elimination_pairings(remaining, had_bye)
+            round_seed = None if seed is None else seed + round_no * len(roster)
+            winners = set(_run_round(executor, pairings, rules, round_seed, standings, batch_size, on_result))
+            # Keep bracket order stable regardless of which match finished first
+            remaining = [a if a[0] in winners else b for a, b in pairings]
+            if bye is not None:
+                had_bye.add(bye[0])
+                remaining.append(bye)
+            round_no += 1
+        return standings
+    finally:
+        if executor is not None:
+            executor.shutdown()